@@ -13,6 +13,15 @@ class Settings:
     # Constants
     PROCESSING_TIMEOUT = 300
     CACHE_CLEANUP_INTERVAL = 3600
+
+    # Upload admission limits
+    UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+    MAX_FILES_PER_UPLOAD = 10
+    MAX_UPLOAD_BYTES_PER_REQUEST = 100 * 1024 * 1024  # 100MB
+    MAX_UPLOAD_BYTES_IN_FLIGHT = 500 * 1024 * 1024  # 500MB spooled, awaiting processing
+    MAX_CONCURRENT_UPLOADS = 4
+    MAX_CONCURRENT_PROCESSING = 1  # PDFs embedded at once, in worker threads
+    UPLOAD_RETRY_AFTER = 30  # seconds
     
     @property
     def VECTOR_STORE_DIR(self) -> Path:
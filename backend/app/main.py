@@ -8,6 +8,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from backend.app.routes import router
 from backend.app.core.config import settings
 from backend.app.services.vector_store_manager import VectorStoreManager
+from backend.app.utils.upload_limiter import UploadAdmissionMiddleware
 
 # Add the project root to Python path
 project_root = Path(__file__).resolve().parent.parent.parent.parent
@@ -39,12 +40,16 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
+# Runs before any request body is read; added first so CORS wraps its 411/413/429s
+app.add_middleware(UploadAdmissionMiddleware, path="/api/upload/")
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000"],
     allow_credentials=True,
     allow_methods=["*"],
-    allow_headers=["*"]
+    allow_headers=["*"],
+    expose_headers=["Retry-After"]
 )
 
 app.include_router(router, prefix="/api")
@@ -1,5 +1,5 @@
 # backend/app/routes.py
-from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks
+from fastapi import APIRouter, UploadFile, File, HTTPException, Request
 from fastapi.responses import JSONResponse
 from backend.app.services.document_processing import process_uploaded_files  # Changed from relative to absolute
 from backend.app.services.query_service import handle_query
@@ -9,12 +9,14 @@ from backend.app.services.vector_store_manager import VectorStoreManager
 router = APIRouter()
 
 @router.post("/upload/")
-async def upload_pdfs(
-    background_tasks: BackgroundTasks, 
-    files: list[UploadFile] = File(...)
-):
+async def upload_pdfs(request: Request, files: list[UploadFile] = File(...)):
     try:
-        return await process_uploaded_files(background_tasks, files)
+        return await process_uploaded_files(
+            files,
+            getattr(request.state, "upload_reservation", None)
+        )
+    except HTTPException:
+        raise  # Keep 4xx/429 responses and their headers intact
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
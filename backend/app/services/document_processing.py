@@ -2,66 +2,107 @@
 import uuid
 import time
 from fastapi import HTTPException  # This is the critical import
-from fastapi import UploadFile, BackgroundTasks
+from fastapi import UploadFile
 from pathlib import Path
+from typing import Optional
 import asyncio
 from backend.app.services.vector_store_manager import VectorStoreManager
 from backend.app.utils.file_utils import save_uploaded_file
+from backend.app.utils.upload_limiter import UploadReservation, upload_limiter
 from backend.app.core.config import settings
 
-async def process_uploaded_files(background_tasks: BackgroundTasks, files: list[UploadFile]):
+# Strong references to running processing tasks so they aren't garbage collected
+_processing_tasks = set()
+_processing_semaphore = None
+
+def _get_processing_semaphore() -> asyncio.Semaphore:
+    """Create the semaphore lazily so it binds to the running event loop"""
+    global _processing_semaphore
+    if _processing_semaphore is None:
+        _processing_semaphore = asyncio.Semaphore(settings.MAX_CONCURRENT_PROCESSING)
+    return _processing_semaphore
+
+async def process_uploaded_files(
+    files: list[UploadFile],
+    reservation: Optional[UploadReservation] = None
+):
+    spooled = []
     try:
         if not files:
             raise HTTPException(status_code=400, detail="No files uploaded")
 
-        vector_store_manager = VectorStoreManager()
-        results = []
+        if len(files) > settings.MAX_FILES_PER_UPLOAD:
+            raise HTTPException(
+                status_code=413,
+                detail=f"At most {settings.MAX_FILES_PER_UPLOAD} files can be uploaded at once"
+            )
 
-        for file in files:
-            if not file.filename.lower().endswith('.pdf'):
-                continue
+        pdf_files = [file for file in files if file.filename.lower().endswith('.pdf')]
+        if not pdf_files:
+            raise HTTPException(
+                status_code=400,
+                detail="No valid PDF files were uploaded"
+            )
 
-            file_id = f"{uuid.uuid4().hex}_{file.filename}"
+        # Slots and Content-Length are admitted by UploadAdmissionMiddleware,
+        # which hands the request's byte reservation in. Spool everything
+        # before scheduling, so a failure leaves nothing behind
+        remaining = settings.MAX_UPLOAD_BYTES_PER_REQUEST
+        for file in pdf_files:
             try:
-                file_path = await save_uploaded_file(file)
-                
-                vector_store_manager.vector_store_cache[file_id] = {
-                    "status": "uploaded",
-                    "filename": file.filename,
-                    "timestamp": time.time(),
-                    "message": "File received, starting processing"
-                }
-                vector_store_manager._save_statuses()
-
-                background_tasks.add_task(
-                    process_single_pdf,
-                    file_path,
-                    file_id,
-                    vector_store_manager
+                upload = await save_uploaded_file(
+                    file,
+                    max_bytes=remaining,
+                    reservation=reservation
                 )
-
-                results.append({
-                    "file_id": file_id,
-                    "filename": file.filename,
-                    "status": "processing_started"
-                })
-
+            except HTTPException:
+                raise
             except Exception as e:
-                if 'file_path' in locals():
-                    try:
-                        Path(file_path).unlink(missing_ok=True)
-                    except:
-                        pass
                 raise HTTPException(
                     status_code=500,
                     detail=f"Failed to process {file.filename}: {str(e)}"
                 )
+            finally:
+                # Drop Starlette's copy now instead of after the response
+                await file.close()
+            remaining -= upload["size"]
+            spooled.append((file, upload))
 
-        if not results:
-            raise HTTPException(
-                status_code=400,
-                detail="No valid PDF files were uploaded"
-            )
+        vector_store_manager = VectorStoreManager()
+        results = []
+
+        for file, upload in spooled:
+            file_id = f"{uuid.uuid4().hex}_{file.filename}"
+            vector_store_manager.vector_store_cache[file_id] = {
+                "status": "uploaded",
+                "filename": file.filename,
+                "size": upload["size"],
+                "sha256": upload["sha256"],
+                "page_count_estimate": upload["page_count_estimate"],
+                "timestamp": time.time(),
+                "message": "File received, queued for processing"
+            }
+
+            # Not a BackgroundTask: those are skipped if the response send
+            # fails, which would leak the spool file and its byte budget
+            task = asyncio.create_task(process_single_pdf(
+                upload["path"],
+                file_id,
+                vector_store_manager,
+                upload["reserved_bytes"]
+            ))
+            _processing_tasks.add(task)
+            task.add_done_callback(_processing_tasks.discard)
+
+            results.append({
+                "file_id": file_id,
+                "filename": file.filename,
+                "sha256": upload["sha256"],
+                "page_count_estimate": upload["page_count_estimate"],
+                "status": "processing_started"
+            })
+        vector_store_manager._save_statuses()
+        spooled = []
 
         return {
             "message": "PDFs uploaded successfully",
@@ -75,39 +116,52 @@ async def process_uploaded_files(background_tasks: BackgroundTasks, files: list[
             status_code=500,
             detail=f"Unexpected error: {str(e)}"
         )
+    finally:
+        # Anything still here was never handed to a processing task
+        for _, upload in spooled:
+            Path(upload["path"]).unlink(missing_ok=True)
+            upload_limiter.release(upload["reserved_bytes"])
 
-async def process_single_pdf(file_path: str, file_id: str, vector_store_manager: VectorStoreManager):
+async def process_single_pdf(
+    file_path: str,
+    file_id: str,
+    vector_store_manager: VectorStoreManager,
+    spooled_bytes: int = 0
+):
     try:
         from backend.app.services.pdf_processor import process_pdf
         
-        vector_store_manager.vector_store_cache[file_id].update({
-            "status": "processing",
-            "message": "Creating vector embeddings",
-            "timestamp": time.time()
-        })
-        vector_store_manager._save_statuses()
-        
-        # Get FAISS vector store directly
-        vector_store = await process_pdf(file_path)
-        
-        if vector_store is None:
-            raise ValueError("Failed to create vector store - no content found")
-            
-        # Save the vector store
-        save_path = settings.VECTOR_STORE_DIR / file_id
-        vector_store.save_local(str(save_path))
-        
-        vector_store_manager.vector_store_cache[file_id].update({
-            "status": "done",
-            "message": "Processing completed",
-            "vector_count": vector_store.index.ntotal,
-            "timestamp": time.time()
-        })
-        vector_store_manager._save_statuses()
-        
-        # Update active store
-        await vector_store_manager._update_active_store()
-        
+        # The CPU-bound steps run in worker threads; the semaphore bounds how
+        # many of them compete with query traffic at once
+        async with _get_processing_semaphore():
+            vector_store_manager.vector_store_cache[file_id].update({
+                "status": "processing",
+                "message": "Creating vector embeddings",
+                "timestamp": time.time()
+            })
+            vector_store_manager._save_statuses()
+
+            # Get FAISS vector store directly
+            vector_store = await process_pdf(file_path)
+
+            if vector_store is None:
+                raise ValueError("Failed to create vector store - no content found")
+
+            # Save the vector store
+            save_path = settings.VECTOR_STORE_DIR / file_id
+            await asyncio.to_thread(vector_store.save_local, str(save_path))
+
+            vector_store_manager.vector_store_cache[file_id].update({
+                "status": "done",
+                "message": "Processing completed",
+                "vector_count": vector_store.index.ntotal,
+                "timestamp": time.time()
+            })
+            vector_store_manager._save_statuses()
+
+            # Update active store
+            await vector_store_manager._update_active_store()
+
     except Exception as e:
         vector_store_manager.vector_store_cache[file_id].update({
             "status": "failed",
@@ -115,9 +169,11 @@ async def process_single_pdf(file_path: str, file_id: str, vector_store_manager:
             "timestamp": time.time()
         })
         vector_store_manager._save_statuses()
-        raise
+        # Not re-raised: the failure is recorded in the status and nothing awaits this task
+        print(f"Warning: Processing {file_id} failed: {str(e)}")
     finally:
         try:
             Path(file_path).unlink(missing_ok=True)
         except Exception as e:
-            print(f"Warning: Failed to clean up {file_path}: {str(e)}")
\ No newline at end of file
+            print(f"Warning: Failed to clean up {file_path}: {str(e)}")
+        upload_limiter.release(spooled_bytes)
\ No newline at end of file
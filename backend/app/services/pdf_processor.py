@@ -6,6 +6,20 @@ from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_core.documents import Document
 from backend.app.services.ocr_service import extract_text_from_pdf
 import os
+import asyncio
+
+def _build_vector_store(documents: list) -> FAISS:
+    """Split and embed documents (blocking)"""
+    text_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=1000,
+        chunk_overlap=200
+    )
+    split_docs = text_splitter.split_documents(documents)
+
+    embeddings = HuggingFaceEmbeddings(
+        model_name="sentence-transformers/all-MiniLM-L6-v2"
+    )
+    return FAISS.from_documents(split_docs, embeddings)
 
 async def process_pdf(pdf_path: str):
     """Process both text and scanned PDFs"""
@@ -16,7 +30,7 @@ async def process_pdf(pdf_path: str):
         # Try regular text extraction first
         try:
             loader = PyMuPDFLoader(pdf_path)
-            documents = loader.load()
+            documents = await asyncio.to_thread(loader.load)
             
             if documents and any(doc.page_content.strip() for doc in documents):
                 print("Text extracted directly from PDF")
@@ -30,17 +44,8 @@ async def process_pdf(pdf_path: str):
                 return None
             documents = [Document(page_content=extracted_text)]
 
-        # Split and embed documents
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200
-        )
-        split_docs = text_splitter.split_documents(documents)
-
-        embeddings = HuggingFaceEmbeddings(
-            model_name="sentence-transformers/all-MiniLM-L6-v2"
-        )
-        return FAISS.from_documents(split_docs, embeddings)
+        # Embedding is CPU bound; keep it off the event loop
+        return await asyncio.to_thread(_build_vector_store, documents)
 
     except Exception as e:
         print(f"PDF processing failed: {str(e)}")
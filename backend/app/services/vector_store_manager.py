@@ -2,6 +2,7 @@
 import os
 import time
 import json
+import asyncio
 from pathlib import Path
 from typing import Dict, List, Optional
 from langchain_community.vectorstores import FAISS
@@ -141,9 +142,16 @@ class VectorStoreManager:
             if data.get("status") == "done"
             and (settings.VECTOR_STORE_DIR / file_id).exists()
         ]
-        
-        self.active_vector_store = None
-        
+
+        # Load and merge off the event loop, then swap so queries never see a partial store
+        self.active_vector_store = await asyncio.to_thread(
+            self._build_active_store, processed_files
+        )
+
+    def _build_active_store(self, processed_files: List[str]) -> Optional[FAISS]:
+        """Load and merge the given vector stores (blocking)"""
+        active_vector_store = None
+
         for file_id in processed_files:
             try:
                 vector_store = FAISS.load_local(
@@ -152,15 +160,17 @@ class VectorStoreManager:
                     allow_dangerous_deserialization=True
                 )
                 
-                if self.active_vector_store is None:
-                    self.active_vector_store = vector_store
+                if active_vector_store is None:
+                    active_vector_store = vector_store
                 else:
-                    self.active_vector_store.merge_from(vector_store)
+                    active_vector_store.merge_from(vector_store)
                     
             except Exception as e:
                 print(f"Warning: Could not load {file_id}: {str(e)}")
                 continue
 
+        return active_vector_store
+
     def get_active_store(self) -> Optional[FAISS]:
         """Get the current active vector store"""
         return self.active_vector_store
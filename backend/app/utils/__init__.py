@@ -1,4 +1,5 @@
 # backend/app/utils/__init__.py
 from .file_utils import save_uploaded_file
+from .upload_limiter import UploadAdmissionMiddleware, UploadLimiter, UploadReservation, upload_limiter
 
-__all__ = ['save_uploaded_file']
\ No newline at end of file
+__all__ = ['save_uploaded_file', 'UploadAdmissionMiddleware', 'UploadLimiter', 'UploadReservation', 'upload_limiter']
\ No newline at end of file
@@ -1,29 +1,110 @@
 # backend/app/utils/file_utils.py
 import os
+import re
+import asyncio
+import hashlib
 import tempfile
 from pathlib import Path
-from typing import Union
-from fastapi import UploadFile
+from typing import Optional
+from fastapi import HTTPException, UploadFile
+from backend.app.core.config import settings
+from backend.app.utils.upload_limiter import UploadReservation
 
-async def save_uploaded_file(file: UploadFile) -> str:
-    """Save uploaded file to temporary location and return path"""
+# Page objects are "/Type /Page"; the lookahead excludes the "/Pages" tree nodes
+_PAGE_PATTERN = re.compile(rb"/Type\s{0,16}/Page(?![A-Za-z])")
+_PAGE_PATTERN_OVERLAP = 64
+
+class _PageCounter:
+    """Count PDF page objects across chunk boundaries.
+
+    Best-effort: pages stored inside compressed object streams (common in
+    PDF 1.5+) are not seen, so the count can be lower than the real one.
+    ``estimate`` is None when no page objects were found at all.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._tail = b""
+
+    def feed(self, chunk: bytes, final: bool = False):
+        buf = self._tail + chunk
+        # Matches ending before this offset were counted on the previous call
+        start = len(self._tail)
+        limit = len(buf) if final else len(buf) - 1
+        for match in _PAGE_PATTERN.finditer(buf):
+            if start <= match.end() <= limit:
+                self.count += 1
+        self._tail = buf[-_PAGE_PATTERN_OVERLAP:]
+
+    @property
+    def estimate(self) -> Optional[int]:
+        return self.count or None
+
+def _create_spool_file(suffix: str) -> tuple[int, str]:
+    temp_dir = Path(tempfile.gettempdir()) / "rag_uploads"
+    temp_dir.mkdir(exist_ok=True, parents=True)
+    return tempfile.mkstemp(dir=temp_dir, suffix=suffix)
+
+def _write_chunk(f, chunk: bytes, digest, page_counter: _PageCounter):
+    f.write(chunk)
+    digest.update(chunk)
+    page_counter.feed(chunk)
+
+async def save_uploaded_file(
+    file: UploadFile,
+    max_bytes: Optional[int] = None,
+    reservation: Optional[UploadReservation] = None
+) -> dict:
+    """Stream an upload to a unique temporary file.
+
+    Blocking file I/O runs in a worker thread. Returns the spooled path along
+    with its size, SHA-256 and ``page_count_estimate``, a lower bound that is
+    None when the page objects are compressed. Bytes are taken from
+    ``reservation`` as they are written; on success the caller owns
+    ``reserved_bytes`` and must release them on the limiter once the file is
+    removed.
+    """
+    file_path = None
+    size = 0
+    saved = False
     try:
-        # Create temp directory if it doesn't exist
-        temp_dir = Path(tempfile.gettempdir()) / "rag_uploads"
-        temp_dir.mkdir(exist_ok=True, parents=True)
-        
-        # Create file path
-        file_path = temp_dir / file.filename
-        
-        # Save file in chunks
-        with open(file_path, "wb") as f:
-            while content := await file.read(1024 * 1024):  # 1MB chunks
-                f.write(content)
-        
-        return str(file_path)
-    
+        fd, file_path = await asyncio.to_thread(
+            _create_spool_file, Path(file.filename or "").suffix
+        )
+        digest = hashlib.sha256()
+        page_counter = _PageCounter()
+
+        with os.fdopen(fd, "wb") as f:
+            while chunk := await file.read(settings.UPLOAD_CHUNK_SIZE):
+                if max_bytes is not None and size + len(chunk) > max_bytes:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"Upload exceeds the {max_bytes} byte limit for this request"
+                    )
+                if reservation is not None:
+                    reservation.take(len(chunk))
+                size += len(chunk)
+                await asyncio.to_thread(_write_chunk, f, chunk, digest, page_counter)
+
+        page_counter.feed(b"", final=True)
+        saved = True
+        return {
+            "path": file_path,
+            "size": size,
+            "reserved_bytes": size if reservation is not None else 0,
+            "sha256": digest.hexdigest(),
+            "page_count_estimate": page_counter.estimate
+        }
+
+    except HTTPException:
+        raise
     except Exception as e:
-        # Clean up if error occurs
-        if 'file_path' in locals() and file_path.exists():
-            file_path.unlink()
-        raise RuntimeError(f"Failed to save uploaded file: {str(e)}")
\ No newline at end of file
+        raise RuntimeError(f"Failed to save uploaded file: {str(e)}")
+
+    finally:
+        # Clean up on any failure, including cancellation
+        if not saved:
+            if reservation is not None:
+                reservation.limiter.release(size)
+            if file_path is not None:
+                Path(file_path).unlink(missing_ok=True)
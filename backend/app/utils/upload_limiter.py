@@ -0,0 +1,155 @@
+# backend/app/utils/upload_limiter.py
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from backend.app.core.config import settings
+
+class UploadLimiter:
+    """Global admission control for uploads.
+
+    Tracks how many upload requests are in progress and how many uploaded
+    bytes are on disk, either as request bodies being received or as spool
+    files waiting for processing. Counters are only touched from the event
+    loop, so no locking is needed.
+
+    Limits are per process: with N uvicorn workers the real disk ceiling is
+    N x ``max_bytes_in_flight`` and up to N x ``max_concurrent`` uploads can
+    run at once, so size the settings for the worker count.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = settings.MAX_CONCURRENT_UPLOADS,
+        max_bytes_in_flight: int = settings.MAX_UPLOAD_BYTES_IN_FLIGHT,
+        retry_after: int = settings.UPLOAD_RETRY_AFTER
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_bytes_in_flight = max_bytes_in_flight
+        self.retry_after = retry_after
+        self.active_uploads = 0
+        self.bytes_in_flight = 0
+
+    def _reject(self, reason: str):
+        raise HTTPException(
+            status_code=429,
+            detail=f"Upload rejected: {reason}, try again later",
+            headers={"Retry-After": str(self.retry_after)}
+        )
+
+    def acquire_slot(self):
+        """Take one upload slot or reject the request"""
+        if self.active_uploads >= self.max_concurrent:
+            self._reject("too many concurrent uploads")
+        self.active_uploads += 1
+
+    def release_slot(self):
+        """Give back a slot taken with acquire_slot"""
+        self.active_uploads = max(self.active_uploads - 1, 0)
+
+    def check_capacity(self, nbytes: int):
+        """Fail fast if nbytes would not currently fit in the global budget"""
+        if self.bytes_in_flight + nbytes > self.max_bytes_in_flight:
+            self._reject("server upload capacity exhausted")
+
+    def reserve(self, nbytes: int):
+        """Account nbytes of uploaded data against the global budget"""
+        self.check_capacity(nbytes)
+        self.bytes_in_flight += nbytes
+
+    def release(self, nbytes: int):
+        """Return nbytes to the global budget once the uploaded data is gone"""
+        self.bytes_in_flight = max(self.bytes_in_flight - nbytes, 0)
+
+upload_limiter = UploadLimiter()
+
+class UploadReservation:
+    """Bytes one admitted request reserved on its limiter.
+
+    Spool files ``take`` their share as they are written and then own it:
+    whoever deletes the file releases those bytes on the limiter. Whatever
+    is left (multipart overhead, skipped files) goes back with ``release``.
+    """
+
+    def __init__(self, limiter: UploadLimiter, nbytes: int):
+        self.limiter = limiter
+        self.remaining = nbytes
+
+    def take(self, nbytes: int):
+        """Move nbytes from this reservation to the caller"""
+        if nbytes > self.remaining:
+            raise HTTPException(
+                status_code=413,
+                detail="Upload is larger than its declared Content-Length"
+            )
+        self.remaining -= nbytes
+
+    def release(self):
+        """Return the untaken bytes to the limiter"""
+        self.limiter.release(self.remaining)
+        self.remaining = 0
+
+class UploadAdmissionMiddleware:
+    """ASGI middleware that admits uploads before their body is read.
+
+    Requests to ``path`` must declare a Content-Length. The request holds an
+    upload slot until the response is sent and reserves its Content-Length
+    once, as an ``UploadReservation`` in ``request.state.upload_reservation``.
+    That covers both Starlette's multipart temp files and the spool files
+    taken from it, so an admitted request never runs out of budget midway.
+    """
+
+    def __init__(self, app, path: str = "/api/upload/", limiter: UploadLimiter = upload_limiter):
+        self.app = app
+        self.path = path.rstrip("/")
+        self.limiter = limiter
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or scope["path"].rstrip("/") != self.path
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = None
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                try:
+                    content_length = int(value)
+                except ValueError:
+                    pass
+                break
+
+        try:
+            if content_length is None:
+                raise HTTPException(
+                    status_code=411,
+                    detail="Content-Length header is required for uploads"
+                )
+            if content_length > settings.MAX_UPLOAD_BYTES_PER_REQUEST:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Upload exceeds the {settings.MAX_UPLOAD_BYTES_PER_REQUEST} byte limit for this request"
+                )
+            self.limiter.acquire_slot()
+            try:
+                self.limiter.reserve(content_length)
+            except HTTPException:
+                self.limiter.release_slot()
+                raise
+            reservation = UploadReservation(self.limiter, content_length)
+        except HTTPException as e:
+            response = JSONResponse(
+                status_code=e.status_code,
+                content={"detail": e.detail},
+                headers=e.headers
+            )
+            await response(scope, receive, send)
+            return
+
+        scope.setdefault("state", {})["upload_reservation"] = reservation
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            reservation.release()
+            self.limiter.release_slot()
@@ -0,0 +1,13 @@
+# tests/conftest.py
+import os
+import tempfile
+import pytest
+
+# Settings refuses to import without a key; the tests never call Groq
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+
+@pytest.fixture(autouse=True)
+def spool_dir(tmp_path, monkeypatch):
+    """Point rag_uploads at a per-test directory and return it"""
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    return tmp_path / "rag_uploads"
@@ -0,0 +1,104 @@
+# tests/test_file_utils.py
+import io
+import asyncio
+import hashlib
+import pytest
+from fastapi import HTTPException, UploadFile
+from backend.app.utils.file_utils import _PageCounter, save_uploaded_file
+from backend.app.utils.upload_limiter import UploadLimiter, UploadReservation
+
+PDF = b"%PDF-1.4 /Type /Pages /Type /Page>> /Type/Page /Type\n/Page /Kids" * 4
+
+def make_upload(data: bytes, filename: str = "report.pdf") -> UploadFile:
+    return UploadFile(io.BytesIO(data), filename=filename)
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5, 7, 16, 64, len(PDF)])
+def test_page_counter_matches_across_chunk_boundaries(chunk_size):
+    counter = _PageCounter()
+    for i in range(0, len(PDF), chunk_size):
+        counter.feed(PDF[i:i + chunk_size])
+    counter.feed(b"", final=True)
+    assert counter.estimate == 12
+
+def test_page_counter_counts_page_at_end_of_stream():
+    counter = _PageCounter()
+    counter.feed(b"/Type /Page")
+    assert counter.count == 0
+    counter.feed(b"", final=True)
+    assert counter.estimate == 1
+
+def test_page_counter_estimate_is_none_without_page_objects():
+    counter = _PageCounter()
+    counter.feed(b"%PDF-1.5 /Type /ObjStm compressed", final=True)
+    assert counter.estimate is None
+
+def test_save_uploaded_file_uses_unique_paths(spool_dir):
+    async def spool_twice():
+        return (
+            await save_uploaded_file(make_upload(PDF)),
+            await save_uploaded_file(make_upload(PDF))
+        )
+
+    first, second = asyncio.run(spool_twice())
+    assert first["path"] != second["path"]
+    assert len(list(spool_dir.iterdir())) == 2
+    assert first["size"] == len(PDF)
+    assert first["sha256"] == hashlib.sha256(PDF).hexdigest()
+    assert first["page_count_estimate"] == 12
+    assert first["reserved_bytes"] == 0
+
+def test_save_uploaded_file_takes_bytes_from_reservation():
+    limiter = UploadLimiter(max_bytes_in_flight=1000)
+    limiter.reserve(1000)
+    reservation = UploadReservation(limiter, 1000)
+
+    upload = asyncio.run(save_uploaded_file(make_upload(PDF), reservation=reservation))
+    assert upload["reserved_bytes"] == len(PDF)
+    assert reservation.remaining == 1000 - len(PDF)
+
+    reservation.release()
+    assert limiter.bytes_in_flight == len(PDF)
+
+def test_save_uploaded_file_cleans_up_when_over_limit(spool_dir):
+    limiter = UploadLimiter(max_bytes_in_flight=1000)
+    limiter.reserve(10)
+    reservation = UploadReservation(limiter, 10)
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(save_uploaded_file(make_upload(PDF), reservation=reservation))
+    assert exc_info.value.status_code == 413
+    assert list(spool_dir.iterdir()) == []
+
+    reservation.release()
+    assert limiter.bytes_in_flight == 0
+
+def test_save_uploaded_file_cleans_up_when_cancelled(spool_dir):
+    class StalledUpload:
+        filename = "report.pdf"
+
+        def __init__(self):
+            self.reads = 0
+
+        async def read(self, size: int) -> bytes:
+            self.reads += 1
+            if self.reads > 2:
+                await asyncio.sleep(60)
+            return b"x" * 100
+
+    limiter = UploadLimiter(max_bytes_in_flight=1000)
+    limiter.reserve(1000)
+    reservation = UploadReservation(limiter, 1000)
+
+    async def cancel_midway():
+        task = asyncio.create_task(
+            save_uploaded_file(StalledUpload(), reservation=reservation)
+        )
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_midway())
+    reservation.release()
+    assert limiter.bytes_in_flight == 0
+    assert list(spool_dir.iterdir()) == []
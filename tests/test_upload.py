@@ -0,0 +1,79 @@
+# tests/test_upload.py
+import io
+import asyncio
+import pytest
+from fastapi import HTTPException, UploadFile
+from backend.app.utils.upload_limiter import UploadLimiter, UploadReservation
+
+# The full app pulls in langchain, FAISS and the embedding model
+main = pytest.importorskip("backend.app.main", reason="app dependencies not installed")
+from fastapi.testclient import TestClient
+from backend.app.services import document_processing, pdf_processor
+from backend.app.utils.upload_limiter import upload_limiter
+
+PDF = b"%PDF-1.4 /Type /Page>> /Type /Page>>"
+
+class FakeVectorStoreManager:
+    def __init__(self):
+        self.vector_store_cache = {}
+
+    def _save_statuses(self):
+        pass
+
+@pytest.fixture
+def manager(monkeypatch):
+    fake = FakeVectorStoreManager()
+    monkeypatch.setattr(document_processing, "VectorStoreManager", lambda: fake)
+    return fake
+
+def make_upload(data: bytes, filename: str) -> UploadFile:
+    return UploadFile(io.BytesIO(data), filename=filename)
+
+async def upload_and_process(files, reservation):
+    result = await document_processing.process_uploaded_files(files, reservation)
+    await asyncio.gather(*document_processing._processing_tasks)
+    return result
+
+def test_admission_errors_carry_cors_headers(monkeypatch):
+    monkeypatch.setattr(upload_limiter, "max_concurrent", 0)
+    client = TestClient(main.app)
+    response = client.post(
+        "/api/upload/",
+        files=[("files", ("a.pdf", PDF))],
+        headers={"Origin": "http://localhost:3000"}
+    )
+
+    assert response.status_code == 429
+    assert response.headers["access-control-allow-origin"] == "http://localhost:3000"
+    assert "retry-after" in response.headers["access-control-expose-headers"].lower()
+
+def test_failed_processing_releases_every_file(manager, monkeypatch, spool_dir):
+    limiter = UploadLimiter()
+    monkeypatch.setattr(document_processing, "upload_limiter", limiter)
+
+    async def failing_process_pdf(path):
+        raise ValueError("broken PDF")
+
+    monkeypatch.setattr(pdf_processor, "process_pdf", failing_process_pdf)
+    limiter.reserve(1000)
+    reservation = UploadReservation(limiter, 1000)
+
+    result = asyncio.run(upload_and_process(
+        [make_upload(PDF, "a.pdf"), make_upload(PDF, "a.pdf"), make_upload(b"x", "notes.txt")],
+        reservation
+    ))
+    reservation.release()
+
+    assert [f["page_count_estimate"] for f in result["files"]] == [2, 2]
+    assert all(s["status"] == "failed" for s in manager.vector_store_cache.values())
+    assert limiter.bytes_in_flight == 0
+    assert list(spool_dir.iterdir()) == []
+
+def test_too_many_files_is_rejected(manager, monkeypatch):
+    monkeypatch.setattr(document_processing.settings, "MAX_FILES_PER_UPLOAD", 1)
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(upload_and_process(
+            [make_upload(PDF, "a.pdf"), make_upload(PDF, "b.pdf")],
+            None
+        ))
+    assert exc_info.value.status_code == 413
@@ -0,0 +1,117 @@
+# tests/test_upload_limiter.py
+import pytest
+from fastapi import FastAPI, File, HTTPException, Request, UploadFile
+from fastapi.testclient import TestClient
+from backend.app.core.config import settings
+from backend.app.utils.file_utils import save_uploaded_file
+from backend.app.utils.upload_limiter import (
+    UploadAdmissionMiddleware,
+    UploadLimiter,
+    UploadReservation
+)
+
+def test_reserve_and_release():
+    limiter = UploadLimiter(max_bytes_in_flight=100)
+    limiter.reserve(60)
+    with pytest.raises(HTTPException) as exc_info:
+        limiter.reserve(50)
+    assert exc_info.value.status_code == 429
+    assert exc_info.value.headers["Retry-After"] == str(limiter.retry_after)
+
+    limiter.release(60)
+    limiter.reserve(100)
+    assert limiter.bytes_in_flight == 100
+
+def test_slots_are_limited():
+    limiter = UploadLimiter(max_concurrent=1)
+    limiter.acquire_slot()
+    with pytest.raises(HTTPException) as exc_info:
+        limiter.acquire_slot()
+    assert exc_info.value.status_code == 429
+
+    limiter.release_slot()
+    limiter.acquire_slot()
+    assert limiter.active_uploads == 1
+
+def test_reservation_take_and_release():
+    limiter = UploadLimiter(max_bytes_in_flight=100)
+    limiter.reserve(100)
+    reservation = UploadReservation(limiter, 100)
+
+    reservation.take(30)
+    with pytest.raises(HTTPException) as exc_info:
+        reservation.take(71)
+    assert exc_info.value.status_code == 413
+
+    reservation.release()
+    assert limiter.bytes_in_flight == 30
+    assert reservation.remaining == 0
+
+@pytest.fixture
+def limiter():
+    return UploadLimiter(max_concurrent=2, max_bytes_in_flight=10 * 1024 * 1024)
+
+@pytest.fixture
+def client(limiter):
+    app = FastAPI()
+    app.state.spooled = []
+
+    @app.post("/api/upload/")
+    async def upload(request: Request, files: list[UploadFile] = File(...)):
+        reservation = request.state.upload_reservation
+        for file in files:
+            app.state.spooled.append(
+                await save_uploaded_file(file, reservation=reservation)
+            )
+        return {"files": len(files)}
+
+    app.add_middleware(UploadAdmissionMiddleware, limiter=limiter)
+    return TestClient(app)
+
+def test_middleware_charges_request_once(client, limiter):
+    data = b"x" * (6 * 1024 * 1024)
+    response = client.post("/api/upload/", files=[("files", ("a.pdf", data))])
+
+    assert response.status_code == 200
+    spooled = client.app.state.spooled[0]
+    # Only the spool file is still held; multipart overhead went back
+    assert limiter.bytes_in_flight == spooled["reserved_bytes"] == len(data)
+    assert limiter.active_uploads == 0
+
+def test_middleware_requires_content_length(client, limiter):
+    response = client.post(
+        "/api/upload/",
+        content=iter([b"chunked body"]),
+        headers={"Content-Type": "application/octet-stream"}
+    )
+    assert response.status_code == 411
+    assert limiter.active_uploads == 0
+
+def test_middleware_rejects_oversized_request(client, limiter, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_UPLOAD_BYTES_PER_REQUEST", 100)
+    response = client.post("/api/upload/", files=[("files", ("a.pdf", b"x" * 200))])
+
+    assert response.status_code == 413
+    assert limiter.bytes_in_flight == 0
+
+def test_middleware_rejects_when_budget_is_exhausted(client, limiter):
+    limiter.reserve(limiter.max_bytes_in_flight)
+    response = client.post("/api/upload/", files=[("files", ("a.pdf", b"x"))])
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == str(limiter.retry_after)
+    assert limiter.active_uploads == 0
+
+def test_middleware_rejects_when_slots_are_taken(client, limiter):
+    limiter.acquire_slot()
+    limiter.acquire_slot()
+    response = client.post("/api/upload/", files=[("files", ("a.pdf", b"x"))])
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == str(limiter.retry_after)
+    assert limiter.bytes_in_flight == 0
+
+def test_middleware_ignores_other_routes(client, limiter):
+    limiter.acquire_slot()
+    limiter.acquire_slot()
+    assert client.get("/api/other/").status_code == 404